@@ -56,6 +56,9 @@ async def main():
         print("Error: DISCORD_TOKEN not found in .env file. Please check your configuration.")
         return
         
+    # Route library and cog log records (including logged exceptions) to stderr.
+    discord.utils.setup_logging()
+
     try:
         print("Bot is starting...")
         await bot.start(token)
@@ -1,16 +1,20 @@
 import asyncpg
 import os
 import datetime
+from types import MappingProxyType
 from typing import Optional, List
 
 # --- Static Role and Sub-class Definitions ---
-ROLES = ["Commander", "Infantry", "Armour", "Recon"]
-SUBCLASSES = {
-    "Infantry": ["Anti-Tank", "Assault", "Automatic Rifleman", "Engineer", "Machine Gunner", "Medic", "Officer", "Rifleman", "Support"],
-    "Armour": ["Tank Commander", "Crewman"],
-    "Recon": ["Spotter", "Sniper"]
-}
-RESTRICTED_ROLES = ["Commander", "Recon", "Officer", "Tank Commander"]
+# Frozen at import: these are shared by every cog and must never be mutated at runtime.
+ROLES = ("Commander", "Infantry", "Armour", "Recon")
+SUBCLASSES = MappingProxyType({
+    "Infantry": ("Anti-Tank", "Assault", "Automatic Rifleman", "Engineer", "Machine Gunner", "Medic", "Officer", "Rifleman", "Support"),
+    "Armour": ("Tank Commander", "Crewman"),
+    "Recon": ("Spotter", "Sniper")
+})
+RESTRICTED_ROLES = frozenset(("Commander", "Recon", "Officer", "Tank Commander"))
+# guilds column holding the required Discord role for each restricted role/subclass.
+_RESTRICTED_ROLE_COLUMNS = MappingProxyType({name: name.lower().replace(" ", "_") + "_role_id" for name in RESTRICTED_ROLES})
 
 # --- RSVP Status Enum ---
 class RsvpStatus:
@@ -22,6 +26,9 @@ class Database:
     """A database interface for the Discord event bot."""
     def __init__(self):
         self.pool = None
+        # guild_id -> guilds row (or None). Guild settings only change through the setters below,
+        # which drop the entry, so reads can be served from memory until then.
+        self._guild_configs = {}
 
     async def connect(self):
         try:
@@ -73,11 +80,13 @@ class Database:
                         is_recurring BOOLEAN DEFAULT FALSE,
                         recurrence_rule VARCHAR(50),
                         mention_role_ids BIGINT[],
-                        restrict_to_role_ids BIGINT[]
+                        restrict_to_role_ids BIGINT[],
+                        creator_display_name VARCHAR(255)
                     );
                 """)
                 await connection.execute("ALTER TABLE events ADD COLUMN IF NOT EXISTS mention_role_ids BIGINT[];")
                 await connection.execute("ALTER TABLE events ADD COLUMN IF NOT EXISTS restrict_to_role_ids BIGINT[];")
+                await connection.execute("ALTER TABLE events ADD COLUMN IF NOT EXISTS creator_display_name VARCHAR(255);")
 
 
                 await connection.execute("""
@@ -100,22 +109,22 @@ class Database:
                                 await connection.execute("INSERT INTO subclasses (role_id, name) VALUES ($1, $2);", role_id, subclass_name)
                 print("Database setup is complete.")
 
-    async def create_event(self, guild_id: int, channel_id: int, creator_id: int, data: dict) -> int:
+    async def create_event(self, guild_id: int, channel_id: int, creator_id: int, data: dict, creator_display_name: str = None) -> int:
         async with self.pool.acquire() as connection:
             return await connection.fetchval(
                 """
                 INSERT INTO events (
                     guild_id, channel_id, creator_id, title, description, 
                     event_time, end_time, timezone, is_recurring, recurrence_rule,
-                    mention_role_ids, restrict_to_role_ids
+                    mention_role_ids, restrict_to_role_ids, creator_display_name
                 )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
                 RETURNING event_id;
                 """,
                 guild_id, channel_id, creator_id, data.get('title'), data.get('description'),
                 data.get('start_time'), data.get('end_time'), data.get('timezone'),
                 data.get('is_recurring', False), data.get('recurrence_rule'),
-                data.get('mention_role_ids'), data.get('restrict_to_role_ids')
+                data.get('mention_role_ids'), data.get('restrict_to_role_ids'), creator_display_name
             )
 
     async def update_event(self, event_id: int, data: dict):
@@ -134,6 +143,12 @@ class Database:
                 event_id
             )
 
+    async def _get_guild_config(self, guild_id: int):
+        if guild_id not in self._guild_configs:
+            async with self.pool.acquire() as connection:
+                self._guild_configs[guild_id] = await connection.fetchrow("SELECT * FROM guilds WHERE guild_id = $1;", guild_id)
+        return self._guild_configs[guild_id]
+
     async def _ensure_guild_exists(self, connection, guild_id: int):
         await connection.execute("INSERT INTO guilds (guild_id) VALUES ($1) ON CONFLICT (guild_id) DO NOTHING;", guild_id)
 
@@ -141,6 +156,7 @@ class Database:
         async with self.pool.acquire() as connection:
             await self._ensure_guild_exists(connection, guild_id)
             await connection.execute("UPDATE guilds SET thread_creation_hours = $1 WHERE guild_id = $2;", hours, guild_id)
+        self._guild_configs.pop(guild_id, None)
 
     async def get_events_for_thread_creation(self):
         query = """
@@ -162,24 +178,26 @@ class Database:
         async with self.pool.acquire() as connection:
             await self._ensure_guild_exists(connection, guild_id)
             await connection.execute("UPDATE guilds SET event_manager_role_id = $1 WHERE guild_id = $2;", discord_role_id, guild_id)
+        self._guild_configs.pop(guild_id, None)
 
     async def get_manager_role_id(self, guild_id: int) -> int | None:
-        async with self.pool.acquire() as connection:
-            return await connection.fetchval("SELECT event_manager_role_id FROM guilds WHERE guild_id = $1;", guild_id)
+        config = await self._get_guild_config(guild_id)
+        return config['event_manager_role_id'] if config else None
 
     async def set_restricted_role(self, guild_id: int, role_name: str, discord_role_id: int):
-        column_name = role_name.lower().replace(" ", "_") + "_role_id"
-        if column_name not in ["commander_role_id", "recon_role_id", "officer_role_id", "tank_commander_role_id"]:
+        column_name = _RESTRICTED_ROLE_COLUMNS.get(role_name)
+        if column_name is None:
             raise ValueError("Invalid restricted role name.")
         async with self.pool.acquire() as connection:
             await self._ensure_guild_exists(connection, guild_id)
             await connection.execute(f"UPDATE guilds SET {column_name} = $1 WHERE guild_id = $2;", discord_role_id, guild_id)
+        self._guild_configs.pop(guild_id, None)
 
     async def get_required_role_id(self, guild_id: int, role_or_subclass_name: str) -> int | None:
-        if role_or_subclass_name not in RESTRICTED_ROLES: return None
-        column_name = role_or_subclass_name.lower().replace(" ", "_") + "_role_id"
-        async with self.pool.acquire() as connection:
-            return await connection.fetchval(f"SELECT {column_name} FROM guilds WHERE guild_id = $1;", guild_id)
+        column_name = _RESTRICTED_ROLE_COLUMNS.get(role_or_subclass_name)
+        if column_name is None: return None
+        config = await self._get_guild_config(guild_id)
+        return config[column_name] if config else None
             
     async def update_event_message_id(self, event_id: int, message_id: int):
         async with self.pool.acquire() as connection:
@@ -197,25 +215,37 @@ class Database:
         async with self.pool.acquire() as connection:
             return await connection.fetchrow("SELECT * FROM events WHERE event_id = $1;", event_id)
 
+    async def get_event_for_guild(self, event_id: int, guild_id: int):
+        async with self.pool.acquire() as connection:
+            return await connection.fetchrow("SELECT * FROM events WHERE event_id = $1 AND guild_id = $2;", event_id, guild_id)
+
+    async def get_event_message_ids(self):
+        async with self.pool.acquire() as connection:
+            return await connection.fetch("SELECT message_id, event_id FROM events WHERE message_id IS NOT NULL;")
+
     async def get_event_by_message_id(self, message_id: int):
         async with self.pool.acquire() as connection:
             return await connection.fetchrow("SELECT * FROM events WHERE message_id = $1;", message_id)
 
-    async def set_rsvp(self, event_id: int, user_id: int, status: str):
+    async def set_rsvps(self, event_id: int, statuses: dict):
+        """Writes several users' RSVP statuses for one event in a single transaction."""
         async with self.pool.acquire() as connection:
-            await connection.execute("INSERT INTO signups (event_id, user_id, rsvp_status) VALUES ($1, $2, $3) ON CONFLICT (event_id, user_id) DO UPDATE SET rsvp_status = EXCLUDED.rsvp_status, role_id = NULL, subclass_id = NULL;", event_id, user_id, status)
+            async with connection.transaction():
+                await connection.executemany("INSERT INTO signups (event_id, user_id, rsvp_status) VALUES ($1, $2, $3) ON CONFLICT (event_id, user_id) DO UPDATE SET rsvp_status = EXCLUDED.rsvp_status, role_id = NULL, subclass_id = NULL;", [(event_id, user_id, status) for user_id, status in statuses.items()])
 
-    async def update_signup_role(self, event_id: int, user_id: int, role_name: str, subclass_name: str = None):
+    async def update_signup_role(self, event_id: int, user_id: int, role_name: str, subclass_name: str = None) -> bool:
+        """Sets an accepted signup's role. Returns False if the user isn't currently accepted for the event."""
         async with self.pool.acquire() as connection:
             role_id = await connection.fetchval("SELECT role_id FROM roles WHERE name = $1;", role_name)
             subclass_id = None
             if subclass_name:
                 subclass_id = await connection.fetchval("SELECT subclass_id FROM subclasses WHERE role_id = $1 AND name = $2;", role_id, subclass_name)
-            await connection.execute("UPDATE signups SET role_id = $1, subclass_id = $2 WHERE event_id = $3 AND user_id = $4;", role_id, subclass_id, event_id, user_id)
+            status = await connection.execute("UPDATE signups SET role_id = $1, subclass_id = $2 WHERE event_id = $3 AND user_id = $4 AND rsvp_status = $5;", role_id, subclass_id, event_id, user_id, RsvpStatus.ACCEPTED)
+            return status != "UPDATE 0"
 
     async def get_signups_for_event(self, event_id: int):
         async with self.pool.acquire() as connection:
-            return await connection.fetch("SELECT s.user_id, s.rsvp_status, r.name as role_name, sc.name as subclass_name FROM signups s LEFT JOIN roles r ON s.role_id = r.role_id LEFT JOIN subclasses sc ON s.subclass_id = sc.subclass_id WHERE s.event_id = $1 ORDER BY r.name, sc.name;", event_id)
+            return await connection.fetch("SELECT s.user_id, s.rsvp_status, COALESCE(r.name, 'Unassigned') as role_name, sc.name as subclass_name FROM signups s LEFT JOIN roles r ON s.role_id = r.role_id LEFT JOIN subclasses sc ON s.subclass_id = sc.subclass_id WHERE s.event_id = $1 ORDER BY r.name, sc.name;", event_id)
 
     async def close(self):
         if self.pool: await self.pool.close(); print("Database connection pool closed.")
@@ -1,18 +1,25 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands, ui
 import datetime
-import traceback
+import logging
 import os
-import pytz
-from urllib.parse import urlencode
+import functools
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+from urllib.parse import quote_plus
 import asyncio
+import copy
+import time
+from collections import OrderedDict
+from types import MappingProxyType
 
 # Adjust the import path based on your project structure
 from utils.database import Database, RsvpStatus, ROLES, SUBCLASSES, RESTRICTED_ROLES
 
+log = logging.getLogger(__name__)
+
 # --- HLL Emoji Mapping (Loaded from Environment) ---
-EMOJI_MAPPING = {
+EMOJI_MAPPING = MappingProxyType({
     # Primary Roles
     "Commander": os.getenv("EMOJI_COMMANDER", "⭐"),
     "Infantry": os.getenv("EMOJI_INFANTRY", "💂"),
@@ -33,26 +40,215 @@ EMOJI_MAPPING = {
     "Spotter": os.getenv("EMOJI_SPOTTER", "👀"),
     "Sniper": os.getenv("EMOJI_SNIPER", "🎯"),
     "Unassigned": "❔"
+})
+
+# Text appended after a signup's name for each subclass; no subclass means no tag.
+SUBCLASS_TAG = MappingProxyType({
+    None: "",
+    **{subclass: f" ({EMOJI_MAPPING.get(subclass, '')})" for subclasses in SUBCLASSES.values() for subclass in subclasses},
+})
+
+# Roles in the order their fields appear on the event embed.
+DISPLAY_ROLES = (*ROLES, "Unassigned")
+# Emoji-decorated field name for each displayed role; only the count is added per render.
+_ROLE_FIELD_PREFIX = MappingProxyType({role: f"{EMOJI_MAPPING.get(role, '')} **{role}**" for role in DISPLAY_ROLES})
+# The Accepted section for an event nobody has accepted yet, which is every freshly posted event.
+_EMPTY_ACCEPTED_FIELDS = (("✅ Accepted (0)", "\u200b"), *((f"{_ROLE_FIELD_PREFIX[role]} (0)", "No one yet") for role in ROLES))
+
+# --- Prebuilt Select Options ---
+# ROLES, SUBCLASSES and EMOJI_MAPPING are fixed at import, so the menu options only need building once.
+_ROLE_OPTIONS = tuple(discord.SelectOption(label=role, emoji=EMOJI_MAPPING.get(role)) for role in ROLES)
+_SUBCLASS_OPTIONS = {
+    role: tuple(discord.SelectOption(label=subclass, emoji=EMOJI_MAPPING.get(subclass)) for subclass in subclasses)
+    for role, subclasses in SUBCLASSES.items()
 }
 
+# --- Conversation Limits ---
+CONVERSATION_TTL_SECONDS = 15 * 60  # Idle time after which a DM conversation is reaped
+CONVERSATION_WORKERS = 64  # Conversations that can be in progress at once
+CONVERSATION_QUEUE_SIZE = 32  # Conversations that can wait for a free worker before new ones are turned away
+# Every active conversation is either running on a worker or waiting in the queue.
+MAX_ACTIVE_CONVERSATIONS = CONVERSATION_WORKERS + CONVERSATION_QUEUE_SIZE
+
+# --- RSVP Batching ---
+RSVP_BATCH_WINDOW_SECONDS = 0.25  # Clicks on the same event within this window share one write
+EMBED_UPDATE_DEBOUNCE_SECONDS = 0.5  # Embed refreshes for the same event within this window collapse into one edit
+
+# --- Rendered Embed Cache ---
+EMBED_CACHE_SIZE = 256
+# event_id -> version, bumped whenever the event or its signups are written.
+_event_versions = {}
+# event_id -> (version, embed dict), least recently used first.
+_embed_cache = OrderedDict()
+
+def invalidate_event_embed(event_id: int):
+    """Marks an event's rendered embed as stale after its event row or signups change."""
+    # Bumping a version rather than dropping the entry means a render already in flight
+    # can't re-cache data it read before the write.
+    _event_versions[event_id] = _event_versions.get(event_id, 0) + 1
+    _embed_cache.pop(event_id, None)
+
+# event_id -> (accepted rows, rendered accepted fields). Tentative/decline clicks leave the
+# accepted rows untouched, so their refreshes can reuse this section as-is.
+_accepted_fields_cache = OrderedDict()
+
+def forget_event_embed(event_id: int):
+    """Drops every rendered-embed entry for an event once it has been deleted."""
+    _event_versions.pop(event_id, None)
+    _embed_cache.pop(event_id, None)
+    _accepted_fields_cache.pop(event_id, None)
+
+# (guild_id, creator_id) -> (expiry, display name) for events created before names were stored on the row.
+CREATOR_NAME_TTL_SECONDS = 60 * 60
+_creator_names = OrderedDict()
+
+# --- Render/Edit Concurrency ---
+# Embed builds (DB reads + member resolution) and message edits are capped separately,
+# so a burst of clicks can't saturate the event loop or pile edits onto Discord's REST queue.
+_EMBED_SEMAPHORE = asyncio.Semaphore(8)
+_EDIT_SEMAPHORE = asyncio.Semaphore(4)
+
+# --- Event Lookup Cache ---
+EVENT_CACHE_TTL_SECONDS = 5
+EVENT_CACHE_SIZE = 64
+# event_id -> (expiry, task resolving to the row), least recently used first.
+_event_row_cache = OrderedDict()
+
+async def get_event_row(db: Database, event_id: int):
+    """Returns an event row by ID, sharing one query between every caller within the TTL."""
+    now = time.monotonic()
+    cached = _event_row_cache.get(event_id)
+    if cached and cached[0] > now:
+        _event_row_cache.move_to_end(event_id)
+        task = cached[1]
+    else:
+        task = asyncio.ensure_future(db.get_event_by_id(event_id))
+        _event_row_cache[event_id] = (now + EVENT_CACHE_TTL_SECONDS, task)
+        _event_row_cache.move_to_end(event_id)
+        while len(_event_row_cache) > EVENT_CACHE_SIZE:
+            _event_row_cache.popitem(last=False)
+    try:
+        # Shielded so one caller being cancelled doesn't cancel the query for the others.
+        return await asyncio.shield(task)
+    except Exception:
+        if _event_row_cache.get(event_id, (None, None))[1] is task:
+            del _event_row_cache[event_id]
+        raise
+
+def invalidate_event_row(event_id: int):
+    """Drops a cached event row after it has been written."""
+    _event_row_cache.pop(event_id, None)
+
+# --- Helper function to resolve timezones ---
+@functools.lru_cache(maxsize=64)
+def _tz(name: str) -> ZoneInfo:
+    """Returns the ZoneInfo for an IANA timezone name, cached per process."""
+    return ZoneInfo(name)
+
+@functools.lru_cache(maxsize=1)
+def _tz_names() -> dict:
+    """Maps lowercased IANA timezone names to their canonical spelling, built on first use."""
+    return {name.lower(): name for name in available_timezones()}
+
+def _canonical_tz(name: str) -> str:
+    """Returns the canonical name for a timezone typed in any case (e.g. `europe/london`)."""
+    canonical = _tz_names().get(name.strip().lower())
+    if canonical is None:
+        raise ZoneInfoNotFoundError(f"No time zone found with key {name}")
+    return canonical
+
+_strptime = datetime.datetime.strptime
+
+def _is_cancel(content: str) -> bool:
+    """True if a DM reply is the `cancel` keyword. Checks the length first so long replies aren't lowercased."""
+    return len(content) == 6 and content.lower() == 'cancel'
+
+@functools.lru_cache(maxsize=512)
+def _fmt_dt(epoch: int, style: str) -> str:
+    """Discord timestamp markup, equivalent to discord.utils.format_dt for an aware datetime's epoch."""
+    return f"<t:{epoch}:{style}>"
+
+def _parse_local_datetime(text: str, tz_name: str) -> datetime.datetime:
+    """Parses a `DD-MM-YYYY HH:MM` string as a time in the given timezone. Raises ValueError on bad input."""
+    return _strptime(text, "%d-%m-%Y %H:%M").replace(tzinfo=_tz(tz_name))
+
 # --- Helper function to generate Google Calendar Link ---
 def create_google_calendar_link(event: dict) -> str:
     """Generates a Google Calendar link for the given event."""
-    base_url = "https://www.google.com/calendar/render?action=TEMPLATE"
-    start_time_utc = event['event_time'].astimezone(pytz.utc)
-    end_time_utc = (event['end_time'] or (start_time_utc + datetime.timedelta(hours=2))).astimezone(pytz.utc)
-    params = {
-        'text': event['title'],
-        'dates': f"{start_time_utc.strftime('%Y%m%dT%H%M%SZ')}/{end_time_utc.strftime('%Y%m%dT%H%M%SZ')}",
-        'details': event['description'],
-        'ctz': 'UTC'
-    }
-    return f"{base_url}&{urlencode(params)}"
+    start_time_utc = event['event_time'].astimezone(datetime.timezone.utc)
+    end_time_utc = (event['end_time'] or (start_time_utc + datetime.timedelta(hours=2))).astimezone(datetime.timezone.utc)
+    # The timestamps are URL-safe as formatted; only the free-text fields need quoting.
+    return (
+        f"https://www.google.com/calendar/render?action=TEMPLATE&text={quote_plus(event['title'])}"
+        f"&dates={start_time_utc:%Y%m%dT%H%M%SZ}/{end_time_utc:%Y%m%dT%H%M%SZ}"
+        f"&details={quote_plus(event['description'] or '')}&ctz=UTC"
+    )
+
+# --- Helpers to generate the event embed ---
+async def _resolve_users(bot: commands.Bot, guild: discord.Guild, user_ids) -> dict:
+    """Maps user IDs to members from the cache, fetching only the ones missing from it. Unknown users map to None."""
+    get_member = guild.get_member
+    users = {user_id: get_member(user_id) for user_id in user_ids}
+    missing_ids = [user_id for user_id, user in users.items() if user is None]
+    # Members missing from the cache are requested over the gateway in batches of 100 (and cached for next time).
+    for start in range(0, len(missing_ids), 100):
+        try:
+            members = await guild.query_members(user_ids=missing_ids[start:start + 100], limit=100, cache=True)
+        except (asyncio.TimeoutError, discord.ClientException) as e:
+            log.warning("Could not query members for guild %s: %s", guild.id, e)
+            break
+        for member in members:
+            users[member.id] = member
+    # Anyone still unresolved (e.g. no longer in the guild) falls back to a user lookup.
+    missing_ids = [user_id for user_id, user in users.items() if user is None]
+    if missing_ids:
+        fetched = await asyncio.gather(*(bot.fetch_user(user_id) for user_id in missing_ids), return_exceptions=True)
+        for user_id, user in zip(missing_ids, fetched):
+            users[user_id] = None if isinstance(user, Exception) else user
+    return users
+
+def _build_accepted_fields(accepted, users: dict) -> tuple:
+    """Renders the Accepted header and per-role fields as (name, value) pairs."""
+    # One bucket per known role, plus one for accepted users who haven't picked a role yet.
+    accepted_signups = {role: [] for role in DISPLAY_ROLES}
+    unassigned = accepted_signups["Unassigned"]  # Also catches role names that are no longer in ROLES
+    for signup in accepted:
+        user = users[signup['user_id']]
+        if not user:
+            continue
+        # role_name arrives as "Unassigned" from the query when no role has been picked.
+        role = signup['role_name']
+        signup_text = f"**{user.display_name}**{SUBCLASS_TAG.get(signup['subclass_name'], '')}"
+        accepted_signups.get(role, unassigned).append(signup_text)
+
+    total_accepted = sum(len(v) for v in accepted_signups.values())
+    fields = [(f"✅ Accepted ({total_accepted})", "\u200b")]
+    for role in DISPLAY_ROLES:
+        users_in_role = accepted_signups[role]
+        if role == "Unassigned" and not users_in_role:
+            continue
+        field_value = "\n".join(users_in_role) or "No one yet"
+        fields.append((f"{_ROLE_FIELD_PREFIX[role]} ({len(users_in_role)})", field_value))
+    return tuple(fields)
+
+async def create_event_embed(bot: commands.Bot, event_id: int, db: Database, *, event: dict = None) -> discord.Embed:
+    """Creates the main Discord embed for an event. Pass `event` when the caller already holds a fresh row."""
+    version = _event_versions.get(event_id, 0)
+    cached = _embed_cache.get(event_id)
+    if cached and cached[0] == version:
+        _embed_cache.move_to_end(event_id)
+        # Embed.from_dict keeps references to the dict's fields/footer, so each caller gets its own copy.
+        return discord.Embed.from_dict(copy.deepcopy(cached[1]))
+    async with _EMBED_SEMAPHORE:
+        return await _render_event_embed(bot, event_id, db, version, event)
 
-# --- Helper function to generate the event embed ---
-async def create_event_embed(bot: commands.Bot, event_id: int, db: Database) -> discord.Embed:
-    """Creates the main Discord embed for an event."""
-    event = await db.get_event_by_id(event_id)
+async def _render_event_embed(bot: commands.Bot, event_id: int, db: Database, version: int, event: dict = None) -> discord.Embed:
+    """Builds an event embed from the database and caches it under the given version."""
+    # The signups query doesn't depend on the event row, so both are issued together.
+    if event is None:
+        event, signups = await asyncio.gather(get_event_row(db, event_id), db.get_signups_for_event(event_id))
+    else:
+        signups = await db.get_signups_for_event(event_id)
     if not event:
         return discord.Embed(title="Error", description="Event not found.", color=discord.Color.red())
     
@@ -60,89 +256,122 @@ async def create_event_embed(bot: commands.Bot, event_id: int, db: Database) ->
     if not guild:
         return discord.Embed(title="Error", description="Could not find the server for this event.", color=discord.Color.red())
 
-    signups = await db.get_signups_for_event(event_id)
     gcal_link = create_google_calendar_link(event)
     embed_description = f"{event['description']}\n\n[Add to Google Calendar]({gcal_link})"
-    embed = discord.Embed(title=f"📅 {event['title']}", description=embed_description, color=discord.Color.blue())
-    
-    time_str = f"**Starts:** {discord.utils.format_dt(event['event_time'], style='F')} ({discord.utils.format_dt(event['event_time'], style='R')})"
+
+    start_epoch = int(event['event_time'].timestamp())
+    time_lines = [f"**Starts:** {_fmt_dt(start_epoch, 'F')} ({_fmt_dt(start_epoch, 'R')})"]
     if event['end_time']:
-        time_str += f"\n**Ends:** {discord.utils.format_dt(event['end_time'], style='F')}"
+        time_lines.append(f"**Ends:** {_fmt_dt(int(event['end_time'].timestamp()), 'F')}")
     if event['timezone']:
-        time_str += f"\nTimezone: {event['timezone']}"
-    embed.add_field(name="Time", value=time_str, inline=False)
+        time_lines.append(f"Timezone: {event['timezone']}")
+    time_str = "\n".join(time_lines)
+    # Fields are collected as plain dicts and handed to Embed.from_dict once at the end.
+    fields = [{"name": "Time", "value": time_str, "inline": False}]
 
     # --- NEW: Display recurrence info ---
     if event.get('is_recurring') and event.get('recurrence_rule'):
-        embed.add_field(
-            name="🔁 Recurring Event",
-            value=f"This event recurs **{event['recurrence_rule'].capitalize()}**.",
-            inline=False
-        )
+        fields.append({
+            "name": "🔁 Recurring Event",
+            "value": f"This event recurs **{event['recurrence_rule'].capitalize()}**.",
+            "inline": False
+        })
     
-    creator = guild.get_member(event['creator_id']) or (await bot.fetch_user(event['creator_id']))
-    embed.set_footer(text=f"Event ID: {event_id} | Created by: {creator.display_name}")
-
-    accepted_signups, tentative_users, declined_users = {}, [], []
-    for r in ROLES:
-        accepted_signups[r] = []
-        
+    accepted, others = [], []
     for signup in signups:
-        user = guild.get_member(signup['user_id']) or (await bot.fetch_user(signup['user_id']))
+        (accepted if signup['rsvp_status'] == RsvpStatus.ACCEPTED else others).append(signup)
+
+    # The accepted section only needs re-rendering when the accepted rows themselves change.
+    if not accepted:
+        accepted_fields = _EMPTY_ACCEPTED_FIELDS
+    else:
+        accepted_key = tuple((s['user_id'], s['role_name'], s['subclass_name']) for s in accepted)
+        cached_accepted = _accepted_fields_cache.get(event_id)
+        accepted_fields = cached_accepted[1] if cached_accepted and cached_accepted[0] == accepted_key else None
+
+    # Resolve every signup that still needs rendering in one pass; only users missing from the cache need the API.
+    user_ids = [s['user_id'] for s in (signups if accepted_fields is None else others)]
+    # Events store their creator's name at creation; older rows use a cached name or resolve the creator in the same batch.
+    creator_name = event.get('creator_display_name')
+    creator_key = (guild.id, event['creator_id'])
+    if not creator_name:
+        cached_creator = _creator_names.get(creator_key)
+        if cached_creator and cached_creator[0] > time.monotonic():
+            creator_name = cached_creator[1]
+        else:
+            user_ids.append(event['creator_id'])
+    users = await _resolve_users(bot, guild, user_ids)
+    if not creator_name:
+        creator = users[event['creator_id']]
+        creator_name = creator.display_name if creator else "Unknown"
+        _creator_names[creator_key] = (time.monotonic() + CREATOR_NAME_TTL_SECONDS, creator_name)
+        _creator_names.move_to_end(creator_key)
+        while len(_creator_names) > EMBED_CACHE_SIZE:
+            _creator_names.popitem(last=False)
+
+    if accepted_fields is None:
+        accepted_fields = _build_accepted_fields(accepted, users)
+        # Users that failed to resolve are left out of the section, so don't keep it around;
+        # the next render retries them.
+        if all(users[s['user_id']] is not None for s in accepted):
+            _accepted_fields_cache[event_id] = (accepted_key, accepted_fields)
+            _accepted_fields_cache.move_to_end(event_id)
+            while len(_accepted_fields_cache) > EMBED_CACHE_SIZE:
+                _accepted_fields_cache.popitem(last=False)
+    fields.extend({"name": name, "value": value, "inline": False} for name, value in accepted_fields)
+
+    tentative_users, declined_users = [], []
+    for signup in others:
+        user = users[signup['user_id']]
         if not user:
             continue
-        if signup['rsvp_status'] == RsvpStatus.ACCEPTED:
-            role = signup['role_name'] or "Unassigned"
-            subclass = signup['subclass_name']
-            subclass_emoji = EMOJI_MAPPING.get(subclass, "")
-            signup_text = f"**{user.display_name}**"
-            if subclass:
-                signup_text += f" ({subclass_emoji})"
-            if role in accepted_signups:
-                accepted_signups[role].append(signup_text)
-        elif signup['rsvp_status'] == RsvpStatus.TENTATIVE:
+        if signup['rsvp_status'] == RsvpStatus.TENTATIVE:
             tentative_users.append(user.display_name)
         elif signup['rsvp_status'] == RsvpStatus.DECLINED:
             declined_users.append(user.display_name)
 
-    total_accepted = sum(len(v) for v in accepted_signups.values())
-    embed.add_field(name=f"✅ Accepted ({total_accepted})", value="\u200b", inline=False)
-    for role in ROLES:
-        role_emoji = EMOJI_MAPPING.get(role, "")
-        users_in_role = accepted_signups.get(role, [])
-        field_value = "\n".join(users_in_role) or "No one yet"
-        embed.add_field(name=f"{role_emoji} **{role}** ({len(users_in_role)})", value=field_value, inline=False)
-
     if tentative_users:
-        embed.add_field(name=f"🤔 Tentative ({len(tentative_users)})", value=", ".join(tentative_users), inline=False)
+        fields.append({"name": f"🤔 Tentative ({len(tentative_users)})", "value": ", ".join(tentative_users), "inline": False})
     if declined_users:
-        embed.add_field(name=f"❌ Declined ({len(declined_users)})", value=", ".join(declined_users), inline=False)
-    
+        fields.append({"name": f"❌ Declined ({len(declined_users)})", "value": ", ".join(declined_users), "inline": False})
+
     if event.get('restrict_to_role_ids'):
         roles = [guild.get_role(r_id) for r_id in event['restrict_to_role_ids']]
         role_names = [r.name for r in roles if r]
-        embed.add_field(name="🔒 Restricted Event", value=f"Sign-ups are restricted to members with the following role(s): **{', '.join(role_names)}**", inline=False)
+        fields.append({"name": "🔒 Restricted Event", "value": f"Sign-ups are restricted to members with the following role(s): **{', '.join(role_names)}**", "inline": False})
 
-    return embed
+    embed_data = {
+        "type": "rich",
+        "title": f"📅 {event['title']}",
+        "description": embed_description,
+        "color": discord.Color.blue().value,
+        "footer": {"text": f"Event ID: {event_id} | Created by: {creator_name}"},
+        "fields": fields,
+    }
+    _embed_cache[event_id] = (version, embed_data)
+    _embed_cache.move_to_end(event_id)
+    while len(_embed_cache) > EMBED_CACHE_SIZE:
+        _embed_cache.popitem(last=False)
+    return discord.Embed.from_dict(copy.deepcopy(embed_data))
 
 # --- Conversation and UI Components ---
 class MultiRoleSelect(ui.Select):
     """A multi-select dropdown for Discord roles."""
-    def __init__(self, placeholder: str, guild_roles: list[discord.Role]):
-        options = [discord.SelectOption(label=role.name, value=str(role.id)) for role in guild_roles if role.name != "@everyone"]
+    def __init__(self, placeholder: str, options: list[discord.SelectOption]):
         super().__init__(placeholder=placeholder, min_values=0, max_values=min(25, len(options)), options=options[:25])
 
     async def callback(self, interaction: discord.Interaction):
         self.view.selection = [int(val) for val in self.values]
-        await interaction.response.defer()
+        # Strip the dropdown in the same call that acknowledges the interaction
+        await interaction.response.edit_message(view=None)
         self.view.stop()
 
 class MultiRoleSelectView(ui.View):
     """A view containing the MultiRoleSelect dropdown."""
-    def __init__(self, placeholder: str, guild_roles: list[discord.Role]):
+    def __init__(self, placeholder: str, options: list[discord.SelectOption]):
         super().__init__(timeout=180)
         self.selection = None
-        self.add_item(MultiRoleSelect(placeholder, guild_roles))
+        self.add_item(MultiRoleSelect(placeholder, options))
 
 class ConfirmationView(ui.View):
     """A simple view for Yes/No confirmations."""
@@ -150,97 +379,236 @@ class ConfirmationView(ui.View):
         super().__init__(timeout=120)
         self.value = None
 
+    async def _answer(self, interaction: discord.Interaction, value: bool):
+        # A second click can land before the buttons are removed; only the first one counts.
+        if self.value is not None:
+            await interaction.response.defer()
+            return
+        self.value = value
+        await interaction.response.edit_message(view=None)
+        self.stop()
+
     @ui.button(label="Yes", style=discord.ButtonStyle.green)
     async def confirm(self, interaction: discord.Interaction, button: ui.Button):
-        self.value = True
-        await interaction.response.defer()
-        self.stop()
+        await self._answer(interaction, True)
 
     @ui.button(label="No/Skip", style=discord.ButtonStyle.red)
     async def cancel(self, interaction: discord.Interaction, button: ui.Button):
-        self.value = False
-        await interaction.response.defer()
-        self.stop()
+        await self._answer(interaction, False)
 
-class RoleSelect(ui.Select):
-    """A dropdown for selecting a primary event role."""
-    def __init__(self, db: Database, event_id: int):
-        self.db = db
+class RoleSelect(ui.DynamicItem[ui.Select], template=r"rdg:role:(?P<event_id>[0-9]+)"):
+    """A dropdown for selecting a primary event role.
+
+    The event ID lives in the custom_id, so the dropdown keeps working after restarts
+    without a live view object per signup.
+    """
+    def __init__(self, event_id: int):
         self.event_id = event_id
-        options = [discord.SelectOption(label=role, emoji=EMOJI_MAPPING.get(role)) for role in ROLES]
-        super().__init__(placeholder="Choose your primary role...", min_values=1, max_values=1, options=options)
+        super().__init__(ui.Select(
+            placeholder="Choose your primary role...", min_values=1, max_values=1,
+            options=list(_ROLE_OPTIONS), custom_id=f"rdg:role:{event_id}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Select, match):
+        return cls(int(match["event_id"]))
 
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
-        selected_role = self.values[0]
-        event_record = await self.db.get_event_by_id(self.event_id)
+        db = interaction.client.db
+        selected_role = self.item.values[0]
+        event_record = await get_event_row(db, self.event_id)
+        if not event_record:
+            await interaction.followup.send("This event no longer exists.", ephemeral=True)
+            return
         guild = interaction.client.get_guild(event_record['guild_id'])
-        member = await guild.fetch_member(interaction.user.id)
-        required_role_id = await self.db.get_required_role_id(guild.id, selected_role)
-        if required_role_id and required_role_id not in [r.id for r in member.roles]:
+        # The selects are used from DMs, so the member comes from the guild cache (REST only on a miss).
+        member = guild.get_member(interaction.user.id) or await guild.fetch_member(interaction.user.id)
+        required_role_id = await db.get_required_role_id(guild.id, selected_role)
+        if required_role_id and member.get_role(required_role_id) is None:
             await interaction.followup.send(f"You don't have the required Discord role to sign up as {selected_role}.", ephemeral=True)
             return
         if selected_role in SUBCLASSES:
-            await interaction.followup.send("Now, select your subclass.", view=SubclassSelectView(self.db, selected_role, self.event_id), ephemeral=True)
+            view = SubclassSelectView(selected_role, self.event_id)
+            await interaction.followup.send("Now, select your subclass.", view=view, ephemeral=True)
+            view.stop()
         else:
-            await self.db.update_signup_role(self.event_id, interaction.user.id, selected_role)
+            if not await db.update_signup_role(self.event_id, interaction.user.id, selected_role):
+                await interaction.followup.send("You are not signed up for this event. Press Accept on the event first.", ephemeral=True)
+                await interaction.edit_original_response(view=None)
+                return
+            invalidate_event_embed(self.event_id)
             await interaction.followup.send(f"You have signed up as **{selected_role}**! The event in the server has been updated.", ephemeral=True)
             original_channel = guild.get_channel(event_record['channel_id'])
-            original_message = await original_channel.fetch_message(event_record['message_id'])
-            new_embed = await create_event_embed(interaction.client, self.event_id, self.db)
-            await original_message.edit(embed=new_embed)
-        await interaction.message.delete()
-
-class SubclassSelect(ui.Select):
-    """A dropdown for selecting a role's subclass."""
-    def __init__(self, db: Database, parent_role: str, event_id: int):
-        self.db = db
+            original_message = original_channel.get_partial_message(event_record['message_id'])
+            get_persistent_view(db).schedule_update(interaction.client, self.event_id, original_message)
+        await interaction.edit_original_response(view=None)
+
+class SubclassSelect(ui.DynamicItem[ui.Select], template=r"rdg:subclass:(?P<event_id>[0-9]+):(?P<role>[0-9]+)"):
+    """A dropdown for selecting a role's subclass. The parent role is encoded by its index in ROLES."""
+    def __init__(self, parent_role: str, event_id: int):
         self.parent_role = parent_role
         self.event_id = event_id
-        options = [discord.SelectOption(label=subclass, emoji=EMOJI_MAPPING.get(subclass)) for subclass in SUBCLASSES.get(parent_role, [])]
-        super().__init__(placeholder=f"Choose your {parent_role} subclass...", min_values=1, max_values=1, options=options)
+        super().__init__(ui.Select(
+            placeholder=f"Choose your {parent_role} subclass...", min_values=1, max_values=1,
+            options=list(_SUBCLASS_OPTIONS.get(parent_role, ())),
+            custom_id=f"rdg:subclass:{event_id}:{ROLES.index(parent_role)}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Select, match):
+        return cls(ROLES[int(match["role"])], int(match["event_id"]))
 
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
-        selected_subclass = self.values[0]
-        event_record = await self.db.get_event_by_id(self.event_id)
+        db = interaction.client.db
+        selected_subclass = self.item.values[0]
+        event_record = await get_event_row(db, self.event_id)
+        if not event_record:
+            await interaction.followup.send("This event no longer exists.", ephemeral=True)
+            return
         guild = interaction.client.get_guild(event_record['guild_id'])
-        member = await guild.fetch_member(interaction.user.id)
-        required_role_id = await self.db.get_required_role_id(guild.id, selected_subclass)
-        if required_role_id and required_role_id not in [r.id for r in member.roles]:
+        # The selects are used from DMs, so the member comes from the guild cache (REST only on a miss).
+        member = guild.get_member(interaction.user.id) or await guild.fetch_member(interaction.user.id)
+        required_role_id = await db.get_required_role_id(guild.id, selected_subclass)
+        if required_role_id and member.get_role(required_role_id) is None:
             await interaction.followup.send(f"You don't have the required Discord role to sign up as {selected_subclass}.", ephemeral=True)
             return
-        await self.db.update_signup_role(self.event_id, interaction.user.id, self.parent_role, selected_subclass)
+        if not await db.update_signup_role(self.event_id, interaction.user.id, self.parent_role, selected_subclass):
+            await interaction.followup.send("You are not signed up for this event. Press Accept on the event first.", ephemeral=True)
+            await interaction.edit_original_response(view=None)
+            return
+        invalidate_event_embed(self.event_id)
         await interaction.followup.send(f"You have signed up as **{self.parent_role} ({selected_subclass})**! The event in the server has been updated.", ephemeral=True)
         original_channel = guild.get_channel(event_record['channel_id'])
-        original_message = await original_channel.fetch_message(event_record['message_id'])
-        new_embed = await create_event_embed(interaction.client, self.event_id, self.db)
-        await original_message.edit(embed=new_embed)
-        await interaction.message.delete()
+        original_message = original_channel.get_partial_message(event_record['message_id'])
+        get_persistent_view(db).schedule_update(interaction.client, self.event_id, original_message)
+        await interaction.edit_original_response(view=None)
 
+# These views only carry the dynamic selects into a message. Callers stop() them once sent,
+# since the selects are dispatched through bot.add_dynamic_items rather than the view itself.
 class RoleSelectView(ui.View):
     """A view containing the RoleSelect dropdown."""
-    def __init__(self, db: Database, event_id: int):
-        super().__init__(timeout=180)
-        self.add_item(RoleSelect(db, event_id))
+    def __init__(self, event_id: int):
+        super().__init__(timeout=None)
+        self.add_item(RoleSelect(event_id))
 
 class SubclassSelectView(ui.View):
     """A view containing the SubclassSelect dropdown."""
-    def __init__(self, db: Database, parent_role: str, event_id: int):
-        super().__init__(timeout=180)
-        self.add_item(SubclassSelect(db, parent_role, event_id))
+    def __init__(self, parent_role: str, event_id: int):
+        super().__init__(timeout=None)
+        self.add_item(SubclassSelect(parent_role, event_id))
+
+class _RsvpBatch:
+    """RSVP changes for one event that are waiting to be written together."""
+    __slots__ = ('client', 'message', 'statuses', 'written')
+
+    def __init__(self, client: discord.Client, message: discord.Message):
+        self.client = client
+        self.message = message
+        self.statuses = {}
+        self.written = asyncio.get_running_loop().create_future()
 
 class PersistentEventView(ui.View):
     """The main view with Accept/Tentative/Decline buttons for an event."""
     def __init__(self, db: Database):
         super().__init__(timeout=None)
         self.db = db
+        self._rsvp_batches = {}
+        self._flush_tasks = set()
+        # message_id -> signature of the embed it currently shows
+        self._message_signatures = {}
+        # event_id -> task refreshing that event's embed
+        self._pending_updates = {}
+        # event_id -> (client, message) for events whose embed needs another refresh
+        self._dirty_events = {}
+        # message_id -> event_id for posted events, loaded in setup() and kept current on create/delete
+        self._event_ids_by_message = {}
+
+    def remember_message(self, message_id: int, event_id: int):
+        """Records which event a posted message belongs to."""
+        self._event_ids_by_message[message_id] = event_id
+
+    def forget_message(self, message_id: int):
+        """Drops a posted message's event mapping, e.g. once the event is deleted."""
+        self._event_ids_by_message.pop(message_id, None)
+        self._message_signatures.pop(message_id, None)
+
+    async def get_event_for_message(self, message_id: int):
+        """Returns the event posted in a message, via the shared row cache when the message is already known."""
+        event_id = self._event_ids_by_message.get(message_id)
+        if event_id is not None:
+            event = await get_event_row(self.db, event_id)
+            if event and event['message_id'] == message_id:
+                return event
+        event = await self.db.get_event_by_message_id(message_id)
+        if event:
+            self._event_ids_by_message[message_id] = event['event_id']
+        else:
+            self._event_ids_by_message.pop(message_id, None)
+        return event
+
+    def schedule_update(self, client: discord.Client, event_id: int, message: discord.PartialMessage):
+        """Refreshes an event's embed shortly, coalescing every request made while one is waiting or running."""
+        self._dirty_events[event_id] = (client, message)
+        task = self._pending_updates.get(event_id)
+        if task is None or task.done():
+            self._pending_updates[event_id] = asyncio.create_task(self._run_updates(event_id))
+
+    async def _run_updates(self, event_id: int):
+        # At most one refresh per event is in flight; requests arriving meanwhile only mark it dirty again,
+        # so a steady stream of clicks still gets an edit every window instead of being postponed forever.
+        try:
+            while event_id in self._dirty_events:
+                await asyncio.sleep(EMBED_UPDATE_DEBOUNCE_SECONDS)
+                client, message = self._dirty_events.pop(event_id)
+                try:
+                    new_embed = await create_event_embed(client, event_id, self.db)
+                    await self.update_message(message, new_embed)
+                except discord.HTTPException as e:
+                    log.warning("Failed to update the embed for event %s: %s", event_id, e)
+        finally:
+            if self._pending_updates.get(event_id) is asyncio.current_task():
+                del self._pending_updates[event_id]
+
+    async def update_message(self, message: discord.PartialMessage, embed: discord.Embed):
+        """Edits an event message with a new embed, skipping the API call if nothing visible changed."""
+        signature = hash((embed.title, embed.description, embed.footer.text, tuple((field.name, field.value) for field in embed.fields)))
+        if self._message_signatures.get(message.id) == signature:
+            return
+        async with _EDIT_SEMAPHORE:
+            await message.edit(embed=embed, allowed_mentions=discord.AllowedMentions.none())
+        self._message_signatures[message.id] = signature
+
+    async def queue_rsvp(self, interaction: discord.Interaction, event_id: int, status: str):
+        """Queues an RSVP change and waits until its batch has been written to the database."""
+        batch = self._rsvp_batches.get(event_id)
+        if batch is None:
+            batch = self._rsvp_batches[event_id] = _RsvpBatch(interaction.client, interaction.message)
+            task = asyncio.create_task(self._flush_rsvps(event_id))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        batch.statuses[interaction.user.id] = status
+        await asyncio.shield(batch.written)
+
+    async def _flush_rsvps(self, event_id: int):
+        """Writes a batch of RSVP changes in one transaction, then schedules one embed refresh."""
+        await asyncio.sleep(RSVP_BATCH_WINDOW_SECONDS)
+        batch = self._rsvp_batches.pop(event_id)
+        try:
+            await self.db.set_rsvps(event_id, batch.statuses)
+        except Exception as e:
+            batch.written.set_exception(e)
+            return
+        invalidate_event_embed(event_id)
+        batch.written.set_result(None)
+        self.schedule_update(batch.client, event_id, batch.message)
 
     async def check_restrictions(self, interaction: discord.Interaction, event: dict) -> bool:
         """Checks if the user meets the role restrictions for an event."""
         if event.get('restrict_to_role_ids'):
-            member_roles = [r.id for r in interaction.user.roles]
-            if not any(r_id in member_roles for r_id in event['restrict_to_role_ids']):
+            member_roles = {r.id for r in interaction.user.roles}
+            if member_roles.isdisjoint(event['restrict_to_role_ids']):
                 roles = [interaction.guild.get_role(r_id) for r_id in event['restrict_to_role_ids']]
                 role_names = [r.name for r in roles if r]
                 await interaction.response.send_message(f"Sorry, this event is restricted to members with the following role(s): **{', '.join(role_names)}**", ephemeral=True)
@@ -250,52 +618,47 @@ class PersistentEventView(ui.View):
     @ui.button(label="Accept", style=discord.ButtonStyle.success, custom_id="persistent_view:accept")
     async def accept(self, interaction: discord.Interaction, button: ui.Button):
         try:
-            event = await self.db.get_event_by_message_id(interaction.message.id)
+            event = await self.get_event_for_message(interaction.message.id)
             if not event:
                 await interaction.response.send_message("This event could not be found.", ephemeral=True)
                 return
             if not await self.check_restrictions(interaction, event):
                 return
             
-            await self.db.set_rsvp(event['event_id'], interaction.user.id, RsvpStatus.ACCEPTED)
-            
-            # Defer the response here to avoid "interaction failed"
+            # Defer before writing so the DB round-trip can't push us past Discord's 3s ACK window
             await interaction.response.defer()
-            
-            # Update the original embed first
-            new_embed = await create_event_embed(interaction.client, event['event_id'], self.db)
-            await interaction.message.edit(embed=new_embed)
+            # The embed is refreshed once the batch is flushed
+            await self.queue_rsvp(interaction, event['event_id'], RsvpStatus.ACCEPTED)
             
             # Then send the ephemeral messages
             await interaction.followup.send("I've sent you a DM to complete your signup!", ephemeral=True)
-            await interaction.user.send(f"To complete your signup for **{event['title']}**, please select your role below.", view=RoleSelectView(self.db, event['event_id']))
+            role_view = RoleSelectView(event['event_id'])
+            await interaction.user.send(f"To complete your signup for **{event['title']}**, please select your role below.", view=role_view)
+            role_view.stop()
         except discord.Forbidden:
             await interaction.followup.send("I couldn't send you a DM. Please check your privacy settings.", ephemeral=True)
-        except Exception as e:
-            print(f"--- An error occurred in the 'Accept' button callback ---")
-            traceback.print_exc()
-            if not interaction.response.is_done():
+        except Exception:
+            log.exception("Error in the Accept button callback")
+            if interaction.response.is_done():
+                await interaction.followup.send("An unexpected error occurred. Please check the bot's logs.", ephemeral=True)
+            else:
                 await interaction.response.send_message("An unexpected error occurred. Please check the bot's logs.", ephemeral=True)
 
     @ui.button(label="Tentative", style=discord.ButtonStyle.secondary, custom_id="persistent_view:tentative")
     async def tentative(self, interaction: discord.Interaction, button: ui.Button):
-        event = await self.db.get_event_by_message_id(interaction.message.id)
+        event = await self.get_event_for_message(interaction.message.id)
         if not event or not await self.check_restrictions(interaction, event):
             return
-        await self.db.set_rsvp(event['event_id'], interaction.user.id, RsvpStatus.TENTATIVE)
         await interaction.response.defer()
-        new_embed = await create_event_embed(interaction.client, event['event_id'], self.db)
-        await interaction.message.edit(embed=new_embed)
+        await self.queue_rsvp(interaction, event['event_id'], RsvpStatus.TENTATIVE)
 
     @ui.button(label="Decline", style=discord.ButtonStyle.danger, custom_id="persistent_view:decline")
     async def decline(self, interaction: discord.Interaction, button: ui.Button):
-        event = await self.db.get_event_by_message_id(interaction.message.id)
+        event = await self.get_event_for_message(interaction.message.id)
         if not event:
             return
-        await self.db.set_rsvp(event['event_id'], interaction.user.id, RsvpStatus.DECLINED)
         await interaction.response.defer()
-        new_embed = await create_event_embed(interaction.client, event['event_id'], self.db)
-        await interaction.message.edit(embed=new_embed)
+        await self.queue_rsvp(interaction, event['event_id'], RsvpStatus.DECLINED)
 
 class ConfirmDeleteView(ui.View):
     """A view to confirm event deletion."""
@@ -324,31 +687,123 @@ class EventManagement(commands.Cog):
     def __init__(self, bot: commands.Bot, db: Database):
         self.bot = bot
         self.db = db
-        self.active_conversations = {}
+        # Ordered oldest-activity first; conversations move to the end on every turn.
+        self.active_conversations = OrderedDict()
+        # user_id -> future for the DM reply a conversation is currently waiting on.
+        self._dm_waiters = {}
+        self._conversation_queue = asyncio.Queue(maxsize=CONVERSATION_QUEUE_SIZE)
+        self._conversation_workers = []
+        self.reap_stale_conversations.start()
+
+    async def cog_load(self):
+        """Starts the workers that run DM conversations."""
+        self._conversation_workers = [asyncio.create_task(self._conversation_worker()) for _ in range(CONVERSATION_WORKERS)]
+
+    async def cog_unload(self):
+        """Cleanly cancels the reaper, conversation workers and pending conversations when the cog is unloaded."""
+        self.reap_stale_conversations.cancel()
+        for worker in self._conversation_workers:
+            worker.cancel()
+        await asyncio.gather(*self._conversation_workers, return_exceptions=True)
+        self._conversation_workers = []
+        # Drop conversations that never reached a worker so they don't outlive this cog instance.
+        while not self._conversation_queue.empty():
+            self._conversation_queue.get_nowait()
+            self._conversation_queue.task_done()
+        self.active_conversations.clear()
+        for waiter in self._dm_waiters.values():
+            waiter.cancel()
+        self._dm_waiters.clear()
+        _event_row_cache.clear()
+
+    async def get_event_cached(self, event_id: int, guild_id: int):
+        """Returns an event row in the given guild, reusing one fetched within the last few seconds."""
+        cached = _event_row_cache.get(event_id)
+        if cached is None or cached[0] <= time.monotonic():
+            # Nothing to share; let SQL do the guild filtering.
+            return await self.db.get_event_for_guild(event_id, guild_id)
+        event = await get_event_row(self.db, event_id)
+        return event if event and event['guild_id'] == guild_id else None
+
+    async def _evict_stale_conversations(self):
+        """Cancels conversations idle past the TTL, and the oldest ones beyond the cap."""
+        cutoff = time.monotonic() - CONVERSATION_TTL_SECONDS
+        while self.active_conversations:
+            conversation = next(iter(self.active_conversations.values()))
+            if conversation.last_activity > cutoff and len(self.active_conversations) <= MAX_ACTIVE_CONVERSATIONS:
+                break
+            self.active_conversations.popitem(last=False)
+            log.info("Reaping idle conversation for user %s.", conversation.user.id)
+            try:
+                await conversation.cancel()
+            except discord.HTTPException:
+                pass
+
+    @tasks.loop(minutes=1)
+    async def reap_stale_conversations(self):
+        """Periodically evicts conversations whose user has walked away."""
+        try:
+            await self._evict_stale_conversations()
+        except Exception:
+            log.exception("Error while reaping conversations")
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        """Listens for DM responses for active conversations."""
+        """Hands DM replies to the conversation waiting on that user, if any."""
         if message.author.bot or not isinstance(message.channel, discord.DMChannel):
             return
-        if message.author.id in self.active_conversations:
-            await self.active_conversations[message.author.id].handle_response(message)
+        waiter = self._dm_waiters.pop(message.author.id, None)
+        if waiter and not waiter.done():
+            waiter.set_result(message)
+
+    async def _conversation_worker(self):
+        """Runs queued conversations one at a time until cancelled, always releasing each user's slot."""
+        while True:
+            conversation = await self._conversation_queue.get()
+            try:
+                # A conversation reaped or cancelled while it sat in the queue is dropped, not started.
+                if not conversation.is_finished:
+                    await conversation.start()
+            except Exception:
+                # e.g. a closed-DM user, where even the cancellation notice can't be delivered.
+                log.exception("Conversation for user %s ended with an error", conversation.user.id)
+            finally:
+                self._conversation_queue.task_done()
+                if self.active_conversations.get(conversation.user.id) is conversation:
+                    del self.active_conversations[conversation.user.id]
 
     async def start_conversation(self, interaction: discord.Interaction, event_id: int = None):
         """Starts an event creation/editing conversation in DMs."""
-        if interaction.user.id in self.active_conversations:
+        user_id = interaction.user.id
+        # Turn newcomers away before claiming a slot: counting them toward the cap would only
+        # evict a queued conversation whose queue entry still can't be reused.
+        if self._conversation_queue.full() and user_id not in self.active_conversations:
+            await interaction.response.send_message("I'm busy with other events right now. Please try again in a moment.", ephemeral=True)
+            return
+        conversation = Conversation(self, interaction, self.db, event_id)
+        # Claim the user's slot in one step so a double-invoked command can't start two conversations.
+        if self.active_conversations.setdefault(user_id, conversation) is not conversation:
             await interaction.response.send_message("You are already in an active event creation process. Please finish or `cancel` it first.", ephemeral=True)
             return
+        queued = False
         try:
-            await interaction.response.send_message("I've sent you a DM to start the process!", ephemeral=True)
-            conversation = Conversation(self, interaction, self.db, event_id)
-            self.active_conversations[interaction.user.id] = conversation
-            asyncio.create_task(conversation.start())
+            # Acknowledge straight away; everything below may take longer than Discord's 3s window.
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            await self._evict_stale_conversations()
+            await interaction.user.create_dm()
+            self._conversation_queue.put_nowait(conversation)
+            queued = True
+            await interaction.followup.send("I've sent you a DM to start the process!", ephemeral=True)
+        except asyncio.QueueFull:
+            await interaction.followup.send("I'm busy with other events right now. Please try again in a moment.", ephemeral=True)
         except discord.Forbidden:
             await interaction.followup.send("I couldn't send you a DM. Please check your privacy settings.", ephemeral=True)
-        except Exception as e:
-            print(f"Error starting conversation: {e}")
-            traceback.print_exc()
+        except Exception:
+            log.exception("Error starting conversation")
+        finally:
+            # If the conversation never got going, give the slot back.
+            if not queued and self.active_conversations.get(user_id) is conversation:
+                del self.active_conversations[user_id]
 
     @app_commands.command(name="create", description="Create a new event via DM.")
     async def create(self, interaction: discord.Interaction):
@@ -357,15 +812,16 @@ class EventManagement(commands.Cog):
     @app_commands.command(name="edit", description="Edit an existing event via DM.")
     @app_commands.describe(event_id="The ID of the event to edit.")
     async def edit(self, interaction: discord.Interaction, event_id: int):
-        event = await self.db.get_event_by_id(event_id)
-        if not event or event['guild_id'] != interaction.guild_id:
+        user_id, guild_id = interaction.user.id, interaction.guild_id
+        event = await self.get_event_cached(event_id, guild_id)
+        if not event:
             await interaction.response.send_message("Event not found.", ephemeral=True)
             return
         
-        member = await interaction.guild.fetch_member(interaction.user.id)
-        manager_role_id = await self.db.get_manager_role_id(interaction.guild.id)
-        is_creator = interaction.user.id == event['creator_id']
-        is_manager = manager_role_id and manager_role_id in [r.id for r in member.roles]
+        member = interaction.user  # Already a Member for guild command invocations; no need to re-fetch it
+        manager_role_id = await self.db.get_manager_role_id(guild_id)
+        is_creator = user_id == event['creator_id']
+        is_manager = manager_role_id and member.get_role(manager_role_id) is not None
         is_admin = member.guild_permissions.administrator
         
         if not (is_creator or is_manager or is_admin):
@@ -377,15 +833,16 @@ class EventManagement(commands.Cog):
     @app_commands.command(name="delete", description="Delete an existing event by its ID.")
     @app_commands.describe(event_id="The ID of the event to delete.")
     async def delete(self, interaction: discord.Interaction, event_id: int):
-        event = await self.db.get_event_by_id(event_id)
-        if not event or event['guild_id'] != interaction.guild_id:
+        user_id, guild_id = interaction.user.id, interaction.guild_id
+        event = await self.db.get_event_for_guild(event_id, guild_id)
+        if not event:
             await interaction.response.send_message("Event not found in this server.", ephemeral=True)
             return
         
-        member = await interaction.guild.fetch_member(interaction.user.id)
-        manager_role_id = await self.db.get_manager_role_id(interaction.guild.id)
-        is_creator = interaction.user.id == event['creator_id']
-        is_manager = manager_role_id and manager_role_id in [r.id for r in member.roles]
+        member = interaction.user  # Already a Member for guild command invocations; no need to re-fetch it
+        manager_role_id = await self.db.get_manager_role_id(guild_id)
+        is_creator = user_id == event['creator_id']
+        is_manager = manager_role_id and member.get_role(manager_role_id) is not None
         is_admin = member.guild_permissions.administrator
 
         if not (is_creator or is_manager or is_admin):
@@ -400,8 +857,7 @@ class EventManagement(commands.Cog):
             try:
                 channel = self.bot.get_channel(event['channel_id'])
                 if channel and event.get('message_id'):
-                    message = await channel.fetch_message(event['message_id'])
-                    await message.delete()
+                    await channel.get_partial_message(event['message_id']).delete()
             except discord.NotFound:
                 print(f"Could not find message {event.get('message_id')} to delete for event {event_id}.")
             except discord.Forbidden:
@@ -410,6 +866,9 @@ class EventManagement(commands.Cog):
                 print(f"Error deleting message: {e}")
 
             await self.db.delete_event(event_id)
+            invalidate_event_row(event_id)
+            get_persistent_view(self.db).forget_message(event.get('message_id'))
+            forget_event_embed(event_id)
             await interaction.followup.send("Event has been deleted.", ephemeral=True)
         else:
             await interaction.followup.send("Deletion cancelled.", ephemeral=True)
@@ -428,7 +887,7 @@ class EventManagement(commands.Cog):
 
     @setup.command(name="restricted_role", description="Set the required Discord role for an in-game role.")
     @app_commands.describe(ingame_role="The in-game role to restrict", discord_role="The Discord role required")
-    @app_commands.choices(ingame_role=[app_commands.Choice(name=r, value=r) for r in RESTRICTED_ROLES])
+    @app_commands.choices(ingame_role=[app_commands.Choice(name=r, value=r) for r in sorted(RESTRICTED_ROLES)])
     async def set_restricted_role(self, interaction: discord.Interaction, ingame_role: app_commands.Choice[str], discord_role: discord.Role):
         if not interaction.user.guild_permissions.administrator:
             await interaction.response.send_message("You must be an administrator to use this command.", ephemeral=True)
@@ -445,13 +904,35 @@ class EventManagement(commands.Cog):
         await self.db.set_thread_creation_hours(interaction.guild.id, hours)
         await interaction.response.send_message(f"Event threads will now be created **{hours}** hour(s) before the event starts.", ephemeral=True)
 
+# --- Persistent View Instance ---
+# One PersistentEventView serves every event message; reloads reuse it rather than registering new callbacks.
+_PERSISTENT_VIEW = None
+
+def get_persistent_view(db: Database) -> PersistentEventView:
+    """Returns the shared PersistentEventView, pointing it at the given database."""
+    global _PERSISTENT_VIEW
+    if _PERSISTENT_VIEW is None:
+        _PERSISTENT_VIEW = PersistentEventView(db)
+    else:
+        _PERSISTENT_VIEW.db = db
+    return _PERSISTENT_VIEW
+
 async def setup(bot: commands.Bot, db: Database):
     """Sets up the EventManagement cog and the persistent view."""
-    bot.add_view(PersistentEventView(db))
+    view = get_persistent_view(db)
+    for row in await db.get_event_message_ids():
+        view.remember_message(row['message_id'], row['event_id'])
+    bot.add_view(view)
+    bot.add_dynamic_items(RoleSelect, SubclassSelect)
     await bot.add_cog(EventManagement(bot, db))
 
+class _ConversationCancelled(Exception):
+    """Raised inside a conversation whose pending DM wait was cut short by Conversation.cancel()."""
+
 class Conversation:
     """Handles the multi-step DM conversation for creating/editing an event."""
+    __slots__ = ('cog', 'bot', 'interaction', 'user', 'db', 'event_id', 'data', 'is_finished', 'last_activity', 'guild_roles', '_role_options')
+
     def __init__(self, cog: EventManagement, interaction: discord.Interaction, db: Database, event_id: int = None):
         self.cog = cog
         self.bot = cog.bot
@@ -461,20 +942,27 @@ class Conversation:
         self.event_id = event_id
         self.data = {}
         self.is_finished = False
+        self.last_activity = time.monotonic()
+        # Snapshot the guild's roles once; both role prompts reuse it.
+        self.guild_roles = interaction.guild.roles
+        self._role_options = None
     
     async def start(self):
         """Starts the conversation, loading existing data if editing."""
+        if self.is_finished:
+            return
         try:
             if self.event_id:
-                event_data = await self.db.get_event_by_id(self.event_id)
+                event_data = await self.cog.get_event_cached(self.event_id, self.interaction.guild_id)
                 self.data = dict(event_data) if event_data else {}
                 await self.user.send(f"Now editing event: **{self.data.get('title', 'Unknown')}**.\nYou can type `cancel` at any time to stop.")
             else:
                 await self.user.send("Let's create a new event! You can type `cancel` at any time to stop.")
             await self.run_conversation()
-        except Exception as e:
-            print(f"Error at start of conversation for {self.user.id}")
-            traceback.print_exc()
+        except _ConversationCancelled:
+            pass
+        except Exception:
+            log.exception("Error at start of conversation for %s", self.user.id)
             await self.cancel()
 
     async def run_conversation(self):
@@ -482,8 +970,8 @@ class Conversation:
         steps = [
             ("What is the title of the event?", self.process_text, 'title'),
             ("What timezone should this event use? (e.g., `UTC`, `EST`, `Europe/London`).", self.process_timezone, 'timezone'),
-            ("What is the start date and time? Please use `DD-MM-YYYY HH:MM` format.", self.process_start_time, 'start_time'),
-            ("What is the end date and time? (Optional, press Enter to skip). Format: `DD-MM-YYYY HH:MM`.", self.process_end_time, 'end_time'),
+            ("What is the start date and time? Please use `DD-MM-YYYY HH:MM` format.", self._process_datetime, 'start_time'),
+            ("What is the end date and time? (Optional, press Enter to skip). Format: `DD-MM-YYYY HH:MM`.", functools.partial(self._process_datetime, optional=True), 'end_time'),
             ("Please provide a detailed description for the event.", self.process_text, 'description'),
             (None, self.ask_is_recurring, 'is_recurring'), # NEW STEP
             (None, self.ask_mention_roles, 'mention_role_ids'),
@@ -491,20 +979,56 @@ class Conversation:
         ]
         
         for prompt, processor, data_key in steps:
+            if self.is_finished:
+                # Reaped while a menu step was open.
+                return
+            self._touch()
             if not await processor(prompt, data_key):
                 # Processor returns False if conversation is cancelled/timed out
                 return
 
         await self.finish()
 
+    def _touch(self):
+        """Marks the conversation as active so the cog doesn't reap it."""
+        self.last_activity = time.monotonic()
+        if self.user.id in self.cog.active_conversations:
+            self.cog.active_conversations.move_to_end(self.user.id)
+
+    def _get_role_options(self) -> list[discord.SelectOption]:
+        """Returns the guild role options for the mention/restrict menus, built once per conversation."""
+        if self._role_options is None:
+            self._role_options = [discord.SelectOption(label=role.name, value=str(role.id)) for role in self.guild_roles if not role.is_default()]
+        return list(self._role_options)
+
+    async def _wait_for_message(self) -> discord.Message:
+        """Waits for the user's next DM reply. Raises asyncio.TimeoutError after 5 minutes."""
+        # Registered with the cog's on_message dispatcher rather than bot.wait_for, so each DM is
+        # routed by author ID instead of being run through every open conversation's check.
+        waiter = asyncio.get_running_loop().create_future()
+        self.cog._dm_waiters[self.user.id] = waiter
+        try:
+            msg = await asyncio.wait_for(waiter, timeout=300.0)
+        except asyncio.CancelledError:
+            # cancel() cancels the waiter to stop a reaped conversation; if our own task is
+            # being cancelled (e.g. cog unload) the cancellation must propagate as-is.
+            if self.is_finished and not asyncio.current_task().cancelling():
+                raise _ConversationCancelled from None
+            raise
+        finally:
+            if self.cog._dm_waiters.get(self.user.id) is waiter:
+                del self.cog._dm_waiters[self.user.id]
+        self._touch()
+        return msg
+
     async def process_text(self, prompt, data_key):
         """Processes a simple text response from the user."""
         if self.event_id and self.data.get(data_key):
             prompt += f"\n(Current: `{self.data.get(data_key)}`)"
         await self.user.send(prompt)
         try:
-            msg = await self.bot.wait_for('message', check=lambda m: m.author == self.user and isinstance(m.channel, discord.DMChannel), timeout=300.0)
-            if msg.content.lower() == 'cancel':
+            msg = await self._wait_for_message()
+            if _is_cancel(msg.content):
                 await self.cancel()
                 return False
             self.data[data_key] = msg.content
@@ -523,38 +1047,42 @@ class Conversation:
                 prompt_with_current = prompt
             await self.user.send(prompt_with_current)
             try:
-                msg = await self.bot.wait_for('message', check=lambda m: m.author == self.user and isinstance(m.channel, discord.DMChannel), timeout=300.0)
-                if msg.content.lower() == 'cancel':
+                msg = await self._wait_for_message()
+                if _is_cancel(msg.content):
                     await self.cancel()
                     return False
                 try:
-                    pytz.timezone(msg.content)
-                    self.data[data_key] = msg.content
+                    # ZoneInfo keys are case-sensitive, so store the canonical spelling.
+                    timezone_name = _canonical_tz(msg.content)
+                    _tz(timezone_name)
+                    self.data[data_key] = timezone_name
                     return True
-                except pytz.UnknownTimeZoneError:
+                except (ZoneInfoNotFoundError, ValueError):
                     await self.user.send("That's not a valid timezone. Please try again. (e.g., `UTC`, `US/Eastern`, `Europe/London`)")
             except asyncio.TimeoutError:
                 await self.user.send("You took too long to respond. Conversation cancelled.")
                 await self.cancel()
                 return False
 
-    async def process_start_time(self, prompt, data_key):
-        """Processes and validates the event start time."""
+    async def _process_datetime(self, prompt, data_key, optional=False):
+        """Processes and validates a `DD-MM-YYYY HH:MM` time. Optional times are cleared by an empty reply."""
+        current = self.data.get(data_key)
+        current_val = current.strftime('%d-%m-%Y %H:%M') if current else ('Not set' if optional else '')
+        if self.event_id and current_val:
+            prompt += f"\n(Current: `{current_val}`)"
+        tz_name = self.data.get('timezone') or 'UTC'
         while True:
-            current_val = self.data.get(data_key).strftime('%d-%m-%Y %H:%M') if self.data.get(data_key) else ''
-            if self.event_id and current_val:
-                prompt_with_current = prompt + f"\n(Current: `{current_val}`)"
-            else:
-                prompt_with_current = prompt
-            await self.user.send(prompt_with_current)
+            await self.user.send(prompt)
             try:
-                msg = await self.bot.wait_for('message', check=lambda m: m.author == self.user and isinstance(m.channel, discord.DMChannel), timeout=300.0)
-                if msg.content.lower() == 'cancel':
+                msg = await self._wait_for_message()
+                if _is_cancel(msg.content):
                     await self.cancel()
                     return False
+                if optional and not msg.content:
+                    self.data[data_key] = None
+                    return True
                 try:
-                    tz = pytz.timezone(self.data.get('timezone', 'UTC'))
-                    self.data[data_key] = tz.localize(datetime.datetime.strptime(msg.content, "%d-%m-%Y %H:%M"))
+                    self.data[data_key] = _parse_local_datetime(msg.content, tz_name)
                     return True
                 except ValueError:
                     await self.user.send("Invalid date format. Please use `DD-MM-YYYY HH:MM`.")
@@ -563,34 +1091,6 @@ class Conversation:
                 await self.cancel()
                 return False
 
-    async def process_end_time(self, prompt, data_key):
-        """Processes and validates the optional event end time."""
-        current_val = self.data.get(data_key).strftime('%d-%m-%Y %H:%M') if self.data.get(data_key) else 'Not set'
-        if self.event_id:
-            prompt_with_current = prompt + f"\n(Current: `{current_val}`)"
-        else:
-            prompt_with_current = prompt
-        await self.user.send(prompt_with_current)
-        try:
-            msg = await self.bot.wait_for('message', check=lambda m: m.author == self.user and isinstance(m.channel, discord.DMChannel), timeout=300.0)
-            if msg.content.lower() == 'cancel':
-                await self.cancel()
-                return False
-            if not msg.content:
-                self.data[data_key] = None
-                return True
-            try:
-                tz = pytz.timezone(self.data.get('timezone', 'UTC'))
-                self.data[data_key] = tz.localize(datetime.datetime.strptime(msg.content, "%d-%m-%Y %H:%M"))
-                return True
-            except ValueError:
-                await self.user.send("Invalid date format. Please use `DD-MM-YYYY HH:MM`.")
-                return await self.process_end_time(prompt, data_key) # Retry this step
-        except asyncio.TimeoutError:
-            await self.user.send("You took too long to respond. Conversation cancelled.")
-            await self.cancel()
-            return False
-
     async def ask_is_recurring(self, prompt, data_key):
         """Asks if the event is recurring and handles the follow-up question."""
         view = ConfirmationView()
@@ -608,7 +1108,6 @@ class Conversation:
             await self.cancel()
             return False
 
-        await msg.delete()
         self.data['is_recurring'] = view.value
 
         if view.value: # If user said "Yes"
@@ -624,24 +1123,25 @@ class Conversation:
         if self.event_id and self.data.get(data_key):
             prompt_text += f"\n(Current: `{self.data.get(data_key)}`)"
         
-        await self.user.send(prompt_text)
-        try:
-            msg = await self.bot.wait_for('message', check=lambda m: m.author == self.user and isinstance(m.channel, discord.DMChannel), timeout=300.0)
-            if msg.content.lower() == 'cancel':
+        while True:
+            await self.user.send(prompt_text)
+            try:
+                msg = await self._wait_for_message()
+                if _is_cancel(msg.content):
+                    await self.cancel()
+                    return False
+
+                rule = msg.content.lower()
+                if rule not in ('daily', 'weekly', 'monthly'):
+                    await self.user.send("Invalid input. Please enter `daily`, `weekly`, or `monthly`.")
+                    continue
+
+                self.data[data_key] = rule
+                return True
+            except asyncio.TimeoutError:
+                await self.user.send("You took too long to respond. Conversation cancelled.")
                 await self.cancel()
                 return False
-            
-            rule = msg.content.lower()
-            if rule not in ['daily', 'weekly', 'monthly']:
-                 await self.user.send("Invalid input. Please enter `daily`, `weekly`, or `monthly`.")
-                 return await self.process_recurrence_rule(prompt, data_key) # Retry
-            
-            self.data[data_key] = rule
-            return True
-        except asyncio.TimeoutError:
-            await self.user.send("You took too long to respond. Conversation cancelled.")
-            await self.cancel()
-            return False
 
     async def ask_mention_roles(self, prompt, data_key):
         """Asks the user which roles to mention in the announcement."""
@@ -651,12 +1151,12 @@ class Conversation:
         if view.value is None:
             await msg.delete()
             return False
-        await msg.delete()
         if view.value:
-            select_view = MultiRoleSelectView("Select roles to mention...", self.interaction.guild.roles)
+            select_view = MultiRoleSelectView("Select roles to mention...", self._get_role_options())
             msg = await self.user.send("Please select the roles to mention below.", view=select_view)
             await select_view.wait()
-            await msg.delete()
+            if select_view.selection is None:
+                await msg.delete()
             self.data[data_key] = select_view.selection
         else:
             self.data[data_key] = None
@@ -670,12 +1170,12 @@ class Conversation:
         if view.value is None:
             await msg.delete()
             return False
-        await msg.delete()
         if view.value:
-            select_view = MultiRoleSelectView("Select roles to restrict sign-ups to...", self.interaction.guild.roles)
+            select_view = MultiRoleSelectView("Select roles to restrict sign-ups to...", self._get_role_options())
             msg = await self.user.send("Please select the roles to restrict sign-ups to below.", view=select_view)
             await select_view.wait()
-            await msg.delete()
+            if select_view.selection is None:
+                await msg.delete()
             self.data[data_key] = select_view.selection
         else:
             self.data[data_key] = None
@@ -686,38 +1186,55 @@ class Conversation:
         if self.is_finished: return
         self.is_finished = True
 
-        if self.user.id in self.cog.active_conversations:
-            del self.cog.active_conversations[self.user.id]
+        self.cog.active_conversations.pop(self.user.id, None)
 
         guild = self.interaction.guild
         if self.event_id:
             await self.db.update_event(self.event_id, self.data)
-            await self.user.send("Event updated successfully!")
-            event_record = await self.db.get_event_by_id(self.event_id)
-            original_channel = guild.get_channel(event_record['channel_id'])
-            if original_channel and event_record.get('message_id'):
-                try:
-                    original_message = await original_channel.fetch_message(event_record['message_id'])
-                    new_embed = await create_event_embed(self.bot, self.event_id, self.db)
-                    await original_message.edit(embed=new_embed)
-                except discord.NotFound:
-                    print(f"Could not find original message to edit for event {self.event_id}")
+            invalidate_event_row(self.event_id)
+            invalidate_event_embed(self.event_id)
+
+            async def refresh_event_message():
+                event_record = await get_event_row(self.db, self.event_id)
+                if not event_record:
+                    # Deleted while the edit was being saved.
+                    return
+                original_channel = guild.get_channel(event_record['channel_id'])
+                if original_channel and event_record.get('message_id'):
+                    try:
+                        original_message = original_channel.get_partial_message(event_record['message_id'])
+                        new_embed = await create_event_embed(self.bot, self.event_id, self.db, event=event_record)
+                        await get_persistent_view(self.db).update_message(original_message, new_embed)
+                    except discord.NotFound:
+                        log.warning("Could not find original message to edit for event %s", self.event_id)
+
+            # The confirmation DM and the public message refresh don't depend on each other.
+            await asyncio.gather(self.user.send("Event updated successfully!"), refresh_event_message())
         else:
-            event_id = await self.db.create_event(guild.id, self.interaction.channel.id, self.user.id, self.data)
-            await self.user.send("Event created successfully! Posting it now.")
-            view = PersistentEventView(self.db)
-            embed = await create_event_embed(self.bot, event_id, self.db)
+            event_id = await self.db.create_event(guild.id, self.interaction.channel.id, self.user.id, self.data, self.user.display_name)
+            _, embed = await asyncio.gather(
+                self.user.send("Event created successfully! Posting it now."),
+                create_event_embed(self.bot, event_id, self.db)
+            )
+            view = get_persistent_view(self.db)
             content = ""
             if self.data.get('mention_role_ids'):
                 mentions = [f"<@&{role_id}>" for role_id in self.data['mention_role_ids']]
                 content = " ".join(mentions)
             msg = await self.interaction.channel.send(content=content, embed=embed, view=view)
             await self.db.update_event_message_id(event_id, msg.id)
+            # The row cached while rendering the embed still has no message_id.
+            invalidate_event_row(event_id)
+            view.remember_message(msg.id, event_id)
 
     async def cancel(self):
         """Cancels the conversation and cleans up."""
         if self.is_finished: return
         self.is_finished = True
-        if self.user.id in self.cog.active_conversations:
+        if self.cog.active_conversations.get(self.user.id) is self:
             del self.cog.active_conversations[self.user.id]
+        # Wake the conversation if it is waiting on a DM reply, so it stops instead of running on.
+        waiter = self.cog._dm_waiters.pop(self.user.id, None)
+        if waiter and not waiter.done():
+            waiter.cancel()
         await self.user.send("Event creation/editing cancelled.")
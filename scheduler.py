@@ -1,12 +1,15 @@
 import discord
 from discord.ext import tasks, commands
 import datetime
-import pytz
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import traceback
+import asyncio
 
 # Adjust the import path based on your project structure
 from utils.database import Database, RsvpStatus
 
+THREAD_ADD_CONCURRENCY = 5  # Thread member additions in flight at once; discord.py handles 429 back-off
+
 class Scheduler(commands.Cog):
     """Cog for handling scheduled background tasks like creating event threads."""
     def __init__(self, bot: commands.Bot, db: Database):
@@ -49,11 +52,11 @@ class Scheduler(commands.Cog):
                     # --- NEW: Format the thread name correctly ---
                     try:
                         # Convert event time to the specified timezone for display
-                        event_tz = pytz.timezone(event['timezone'])
+                        event_tz = ZoneInfo(event['timezone'])
                         local_event_time = event['event_time'].astimezone(event_tz)
                         time_str = local_event_time.strftime("%Y-%m-%d %H:%M")
                         thread_name = f"{event['title']} - {time_str} ({event['timezone']})"
-                    except (pytz.UnknownTimeZoneError, TypeError):
+                    except (ZoneInfoNotFoundError, ValueError, TypeError):
                         # Fallback for invalid timezone in DB or other errors
                         time_str = event['event_time'].strftime("%Y-%m-%d %H:%M UTC")
                         thread_name = f"{event['title']} - {time_str}"
@@ -85,18 +88,23 @@ class Scheduler(commands.Cog):
                     # Send a welcome message to the new thread
                     await thread.send(f"Welcome to the private discussion for **{event['title']}**! This thread is for confirmed attendees.")
 
-                    # Add each accepted user to the thread
-                    added_count = 0
-                    for user_id in accepted_user_ids:
-                        try:
-                            # Use guild.get_member first as it's faster (uses cache)
-                            member = guild.get_member(user_id) or await guild.fetch_member(user_id)
-                            await thread.add_user(member)
-                            added_count += 1
-                        except discord.NotFound:
-                            print(f"Scheduler: Could not find member with ID {user_id} in guild {guild.id} to add to thread.")
-                        except discord.HTTPException as e:
-                            print(f"Scheduler: Failed to add user {user_id} to thread for event {event['event_id']}. Error: {e}")
+                    # Add the accepted users to the thread a few at a time
+                    semaphore = asyncio.Semaphore(THREAD_ADD_CONCURRENCY)
+
+                    async def add_to_thread(user_id: int) -> bool:
+                        async with semaphore:
+                            try:
+                                # add_user only needs the ID, so there's no member lookup (or fetch_member round-trip) per user
+                                await thread.add_user(discord.Object(id=user_id))
+                                return True
+                            except discord.NotFound:
+                                print(f"Scheduler: Could not find member with ID {user_id} in guild {guild.id} to add to thread.")
+                            except discord.HTTPException as e:
+                                print(f"Scheduler: Failed to add user {user_id} to thread for event {event['event_id']}. Error: {e}")
+                            return False
+
+                    results = await asyncio.gather(*(add_to_thread(user_id) for user_id in accepted_user_ids))
+                    added_count = sum(results)
 
                     print(f"Scheduler: Added {added_count}/{len(accepted_user_ids)} members to thread for event {event['event_id']}.")
 